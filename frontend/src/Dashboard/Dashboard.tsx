@@ -1,4 +1,4 @@
-import { JSX, useState, useEffect } from "react";
+import { JSX, useState, useEffect, useRef } from "react";
 import {
   Droplets,
   CloudRain,
@@ -72,57 +72,65 @@ export default function Dashboard() {
     return false;
   };
 
-  // --- Fetch IoT data periodically ---
-  useEffect(() => {
-    const fetchData = async () => {
-      try {
-        const res = await fetch("http://127.0.0.1:5000/api/sensor-data");
-        const data = await res.json();
+  // Latest full set of readings; sensor_update only carries the fields that changed
+  const sensorsRef = useRef({ temperature: 0, humidity: 0, tankLevel: 0, feed: 0, light: 0 });
 
-        setTemperature(data.temperature);
-        setHumidity(data.humidity);
-        setTankLevel(data.tankLevel);
-        setFeed(data.feed);
-        setLight(data.light);
-
-        const currentTime = new Date().toLocaleTimeString("en-US", {
-          hour: "2-digit",
-          minute: "2-digit",
-        });
-        setLineData((prev) => {
-          const updated = [...prev, { time: currentTime, temp: data.temperature }];
-          return updated.slice(-20);
-        });
-
-        setBarData([
-          { name: "Feed A", amount: data.feed },
-          { name: "Starter", amount: Math.max(0, data.feed - 10) },
-          { name: "Grower", amount: Math.max(0, data.feed - 20) },
-          { name: "Finisher", amount: Math.max(0, data.feed - 30) },
-        ]);
-
-        setPieData([
-          { name: "Water", value: data.tankLevel },
-          { name: "Feed", value: data.feed },
-          { name: "Electricity", value: Math.round(data.light / 10) },
-          { name: "Maintenance", value: 10 },
-        ]);
-      } catch (err) {
-        console.error("Failed to fetch sensor data:", err);
-      }
-    };
-
-    fetchData();
-    const interval = setInterval(fetchData, 1000);
-    return () => clearInterval(interval);
-  }, []);
-
-// --- WebSocket for device + system state updates ---
+// --- WebSocket for IoT data + device + system state updates ---
 useEffect(() => {
   const socket = io("http://127.0.0.1:5000");
 
   socket.on("connect", () => console.log("✅ Connected to WebSocket"));
 
+  // 📈 Recent sensor history, sent once on connect to backfill the temperature chart
+  socket.on("history_snapshot", (data) => {
+    setLineData(
+      (data.sensors || []).slice(-20).map((row: { timestamp: string; temperature: number }) => ({
+        time: new Date(row.timestamp).toLocaleTimeString("en-US", {
+          hour: "2-digit",
+          minute: "2-digit",
+        }),
+        temp: row.temperature,
+      }))
+    );
+  });
+
+  // 🌡️ Sensor readings: full snapshot on connect, then only the changed fields
+  socket.on("sensor_update", (update) => {
+    const data = { ...sensorsRef.current, ...update };
+    sensorsRef.current = data;
+
+    setTemperature(data.temperature);
+    setHumidity(data.humidity);
+    setTankLevel(data.tankLevel);
+    setFeed(data.feed);
+    setLight(data.light);
+
+    if (update.temperature !== undefined) {
+      const currentTime = new Date().toLocaleTimeString("en-US", {
+        hour: "2-digit",
+        minute: "2-digit",
+      });
+      setLineData((prev) => {
+        const updated = [...prev, { time: currentTime, temp: data.temperature }];
+        return updated.slice(-20);
+      });
+    }
+
+    setBarData([
+      { name: "Feed A", amount: data.feed },
+      { name: "Starter", amount: Math.max(0, data.feed - 10) },
+      { name: "Grower", amount: Math.max(0, data.feed - 20) },
+      { name: "Finisher", amount: Math.max(0, data.feed - 30) },
+    ]);
+
+    setPieData([
+      { name: "Water", value: data.tankLevel },
+      { name: "Feed", value: data.feed },
+      { name: "Electricity", value: Math.round(data.light / 10) },
+      { name: "Maintenance", value: 10 },
+    ]);
+  });
+
   // 🎯 Activity-based events (e.g. "Fan Activated" / "Fan Deactivated")
   socket.on("activity_event", (data) => {
     console.log("📢 Activity Event:", data);
@@ -0,0 +1,23 @@
+"""Gunicorn settings for the dashboard server: gunicorn -c gunicorn.conf.py server:app
+
+Needs gunicorn, gevent and gevent-websocket installed alongside the server dependencies.
+"""
+import os
+
+# server.py reads this at import time to pick the gevent SocketIO mode and monkey-patch first
+os.environ.setdefault("SOCKETIO_ASYNC_MODE", "gevent")
+
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+worker_class = "geventwebsocket.gunicorn.workers.GeventWebSocketWorker"
+# Socket.IO long-polling needs each client pinned to one process, which gunicorn can't do, so
+# keep one worker and scale out with more instances (REDIS_URL set) behind a sticky load balancer
+workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+worker_connections = 1000  # concurrent greenlets (sockets, SSE streams, polls) per worker
+keepalive = 75
+timeout = 60  # above GEMINI_TIMEOUT so a slow answer isn't killed mid-request
+
+
+def post_worker_init(worker):
+    """Start the server's background loops inside each worker once the app is loaded."""
+    import server
+    server.start_background_tasks()
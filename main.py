@@ -7,15 +7,26 @@ and synchronizes sensor data + events to a Flask backend dashboard.
 """
 
 import pygame
+import logging
+import os
 import random
 import math
+import queue
+import threading
+import time
+import numpy as np
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 # --- Constants ---
 WIDTH, HEIGHT = 800, 500
-FPS = 30
+FPS = 30  # Render frames per second
+SIM_HZ = 30  # Simulation ticks per second
+MAX_CATCHUP_TICKS = 5  # Max sim ticks run back-to-back after a slow frame
 CHICKEN_COUNT = 5
-SERVER_URL = "http://127.0.0.1:5000/update-sensor"  # Flask backend endpoint
+BULK_URL = "http://127.0.0.1:5000/bulk"  # Batched events/state/sensors/hotspots
+BULK_INTERVAL = 15  # Frames between bulk sends
 
 # --- Colors ---
 WHITE = (255, 255, 255)
@@ -30,28 +41,98 @@ BLACK = (0, 0, 0)
 BROWN = (139, 69, 19)
 LIGHT_BLUE = (173, 216, 230)
 
+# --- Logging (debug output only when SMARTFARM_DEBUG=1) ---
+logger = logging.getLogger(__name__)
+DEBUG = os.environ.get("SMARTFARM_DEBUG") == "1"
+
+# --- HTTP Session (keep-alive connections to the Flask backend) ---
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=1))
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# --- Background Sender (keeps HTTP I/O off the render loop) ---
+_send_q = queue.Queue(maxsize=64)
+_sender_thread = None
+
+def _sender_loop():
+    """Drain the send queue and POST each payload to the backend."""
+    while True:
+        url, payload = _send_q.get()
+        try:
+            SESSION.post(url, data=orjson.dumps(payload), headers=JSON_HEADERS, timeout=1)
+        except Exception as e:
+            logger.debug("Failed to send to %s: %s", url, e)
+
+def start_sender():
+    """Start the daemon sender thread once."""
+    global _sender_thread
+    if _sender_thread is None:
+        _sender_thread = threading.Thread(target=_sender_loop, name="farm-sender", daemon=True)
+        _sender_thread.start()
+
+def send_async(url, payload):
+    """Queue a POST without blocking; drops the oldest queued item when full."""
+    while True:
+        try:
+            _send_q.put_nowait((url, payload))
+            return
+        except queue.Full:
+            try:
+                _send_q.get_nowait()
+            except queue.Empty:
+                pass
+
+# --- Bulk Batching (one POST per tick instead of one per endpoint) ---
+_pending = {"events": [], "state": None, "sensors": None, "hotspots": None}
+
+def queue_event(title, detail, color):
+    """Add an activity event to the next bulk send."""
+    _pending["events"].append({"title": title, "detail": detail, "color": color})
+
+def queue_update(kind, payload):
+    """Replace the pending ``state``/``sensors``/``hotspots`` payload with the newest one."""
+    _pending[kind] = payload
+
+def flush_pending():
+    """Send everything collected since the last flush as a single /bulk POST."""
+    global _pending
+    if not _pending["events"] and all(_pending[k] is None for k in ("state", "sensors", "hotspots")):
+        return
+    snapshot = _pending
+    _pending = {"events": [], "state": None, "sensors": None, "hotspots": None}
+    send_async(BULK_URL, snapshot)
+
 # --- Radar System for Hotspot Detection ---
 class RadarSystem:
+    GRID_SIZE = 15  # Smaller grid for better detection
+
     def __init__(self):
         self.hotspots = []
         self.scan_radius = 50  # Radar scan radius in pixels
         self.hotspot_threshold = 2  # Minimum chickens to form a hotspot (lowered for demo)
+        self.grid_width = WIDTH // self.GRID_SIZE
+        self.grid_height = HEIGHT // self.GRID_SIZE
+        self._last_cells = None  # chicken cells at the last full scan
         
-    def scan_hotspots(self, chickens):
-        """Scan for chicken hotspots using radar simulation"""
+    def scan_hotspots(self, positions):
+        """Scan for chicken hotspots using radar simulation (``positions`` is an (N, 2) array)"""
+        grid_size = self.GRID_SIZE
+        gw, gh = self.grid_width, self.grid_height
+
+        # Flattened grid cell of every chicken
+        xs = positions[:, 0]
+        ys = positions[:, 1]
+        cells = (np.clip((ys // grid_size).astype(np.int32), 0, gh - 1) * gw
+                 + np.clip((xs // grid_size).astype(np.int32), 0, gw - 1))
+
+        # Nobody crossed a cell boundary since the last scan: the result is the same
+        if self._last_cells is not None and np.array_equal(cells, self._last_cells):
+            return self.hotspots
+        self._last_cells = cells
         self.hotspots = []
-        
-        # Create a grid for hotspot detection
-        grid_size = 15  # Smaller grid for better detection
-        grid_width = WIDTH // grid_size
-        grid_height = HEIGHT // grid_size
-        chicken_counts = [[0 for _ in range(grid_width)] for _ in range(grid_height)]
-        
-        # Count chickens in each grid cell
-        for chicken in chickens:
-            grid_x = min(int(chicken.x // grid_size), grid_width - 1)
-            grid_y = min(int(chicken.y // grid_size), grid_height - 1)
-            chicken_counts[grid_y][grid_x] += 1
+
+        # Count chickens per grid cell
+        chicken_counts = np.bincount(cells, minlength=gw * gh)
         
         # Add persistent demo hotspots for demonstration
         demo_hotspots = [
@@ -61,47 +142,62 @@ class RadarSystem:
         ]
         self.hotspots.extend(demo_hotspots)
         
-        # Identify hotspots (areas with multiple chickens)
-        for y in range(grid_height):
-            for x in range(grid_width):
-                if chicken_counts[y][x] >= self.hotspot_threshold:
-                    # Calculate hotspot center and intensity
-                    center_x = (x * grid_size) + (grid_size // 2)
-                    center_y = (y * grid_size) + (grid_size // 2)
-                    
-                    # Convert to percentage coordinates for frontend
-                    x_percent = (center_x / WIDTH) * 100
-                    y_percent = (center_y / HEIGHT) * 100
-                    
-                    # Calculate intensity based on chicken count and activity
-                    intensity = min(100, chicken_counts[y][x] * 20 + random.uniform(0, 20))
-                    
-                    hotspot_name = f"Hotspot {len(self.hotspots) + 1}"
-                    if x_percent < 30:
-                        hotspot_name = "Feed Area"
-                    elif x_percent > 70:
-                        hotspot_name = "Water Area"
-                    elif y_percent < 30:
-                        hotspot_name = "Resting Zone"
-                    else:
-                        hotspot_name = "Activity Zone"
-                    
-                    self.hotspots.append({
-                        "x": x_percent,
-                        "y": y_percent,
-                        "intensity": intensity,
-                        "name": hotspot_name
-                    })
+        # Identify hotspots (only cells with multiple chickens are visited)
+        for cell in np.flatnonzero(chicken_counts >= self.hotspot_threshold):
+            y, x = divmod(int(cell), gw)
+            count = int(chicken_counts[cell])
+
+            # Calculate hotspot center and intensity
+            center_x = (x * grid_size) + (grid_size // 2)
+            center_y = (y * grid_size) + (grid_size // 2)
+            
+            # Convert to percentage coordinates for frontend
+            x_percent = (center_x / WIDTH) * 100
+            y_percent = (center_y / HEIGHT) * 100
+            
+            # Calculate intensity based on chicken count and activity
+            intensity = min(100, count * 20 + random.uniform(0, 20))
+            
+            if x_percent < 30:
+                hotspot_name = "Feed Area"
+            elif x_percent > 70:
+                hotspot_name = "Water Area"
+            elif y_percent < 30:
+                hotspot_name = "Resting Zone"
+            else:
+                hotspot_name = "Activity Zone"
+            
+            self.hotspots.append({
+                "x": x_percent,
+                "y": y_percent,
+                "intensity": intensity,
+                "name": hotspot_name
+            })
         
         return self.hotspots
 
 # --- Simulation State ---
+ENV_FIELDS = ("temperature", "light", "water_level", "feed_level")
+
+def _env_field(index):
+    """Expose one slot of ``FarmState.env`` as a plain float attribute."""
+    def get(self):
+        return float(self.env[index])
+    def set(self, value):
+        self.env[index] = value
+    return property(get, set)
+
 class FarmState:
+    ENV_LO = np.array([15, 0, 0, 0], dtype=np.float32)
+    ENV_HI = np.array([40, 600, 100, 100], dtype=np.float32)
+
+    temperature = _env_field(0)
+    light = _env_field(1)
+    water_level = _env_field(2)
+    feed_level = _env_field(3)
+
     def __init__(self):
-        self.temperature = 26.0
-        self.light = 320
-        self.water_level = 85
-        self.feed_level = 75
+        self.env = np.array([26.0, 320, 85, 75], dtype=np.float32)  # ordered as ENV_FIELDS
         self.pump = False
         self.fan = False
         self.light_on = False
@@ -109,56 +205,60 @@ class FarmState:
         self.status_message = ""
         self.MAX_HISTORY = 60
         self.radar_system = RadarSystem()
+        self._last_state_tuple = None
 
-        self.history = {k: [] for k in ["temperature", "light", "water_level", "feed_level"]}
+        self.history_ring = np.zeros((self.MAX_HISTORY, len(ENV_FIELDS)), dtype=np.float32)
+        self.history_len = 0
+        self.history_pos = 0  # next row to write
 
-    def update(self):
+    def update(self, _sin=math.sin, _unif=random.uniform):
         """Simulate natural environmental changes and internal dynamics."""
         self.time += 1
+        t = self.time
+        temperature, light, water_level, feed_level = self.env.tolist()
 
         # --- Temperature variation ---
-        ambient_drift = math.sin(self.time / 60) * 0.3 + random.uniform(-0.15, 0.25)
+        ambient_drift = _sin(t / 60) * 0.3 + _unif(-0.15, 0.25)
         if self.fan:
-            self.temperature -= random.uniform(0.2, 0.4)
+            temperature -= _unif(0.2, 0.4)
         else:
-            self.temperature += ambient_drift
+            temperature += ambient_drift
 
         # --- Light variation ---
         if self.light_on:
-            self.light += random.uniform(3, 6)
+            light += _unif(3, 6)
         else:
             # simulate daytime pattern
-            cycle = math.sin(self.time / 100) * 100
-            self.light += cycle * 0.02 + random.uniform(-5, 5)
+            cycle = _sin(t / 100) * 100
+            light += cycle * 0.02 + _unif(-5, 5)
 
         # --- Water level variation ---
-        evap_rate = 0.1 + (0.05 * max(0, (self.temperature - 25) / 10))
+        evap_rate = 0.1 + (0.05 * max(0, (temperature - 25) / 10))
         if self.pump:
-            self.water_level += random.uniform(0.01, 1.5)
+            water_level += _unif(0.01, 1.5)
         else:
-            self.water_level -= evap_rate
+            water_level -= evap_rate
 
         # --- Feed consumption ---
-        consumption = random.uniform(0.01, 0.12)
-        self.feed_level -= consumption
+        consumption = _unif(0.01, 0.12)
+        feed_level -= consumption
+        self.env[:] = (temperature, light, water_level, feed_level)
 
         # --- Clamp values ---
-        self.temperature = max(15, min(40, self.temperature))
-        self.light = max(0, min(600, self.light))
-        self.water_level = max(0, min(100, self.water_level))
-        self.feed_level = max(0, min(100, self.feed_level))
+        np.clip(self.env, self.ENV_LO, self.ENV_HI, out=self.env)
 
         # --- Record history for graph ---
-        if self.time % 5 == 0:
-            for k, v in {
-                "temperature": self.temperature,
-                "light": self.light,
-                "water_level": self.water_level,
-                "feed_level": self.feed_level,
-            }.items():
-                self.history[k].append(v)
-                if len(self.history[k]) > self.MAX_HISTORY:
-                    self.history[k].pop(0)
+        if t % 5 == 0:
+            self.history_ring[self.history_pos] = self.env
+            self.history_pos = (self.history_pos + 1) % self.MAX_HISTORY
+            self.history_len = min(self.history_len + 1, self.MAX_HISTORY)
+
+    def trend(self, field):
+        """Recorded values of ``field`` for the trend graph, oldest first."""
+        column = self.history_ring[:, ENV_FIELDS.index(field)]
+        if self.history_len < self.MAX_HISTORY:
+            return column[:self.history_len]
+        return np.concatenate((column[self.history_pos:], column[:self.history_pos]))
 
     def automation_agent(self):
 
@@ -217,160 +317,242 @@ class FarmState:
         # --- Send first triggered event ---
         if events:
             event = events[0]
-            try:
-                requests.post(
-                    "http://127.0.0.1:5000/activity-event",
-                    json={"title": event[0], "detail": event[1], "color": event[2]},
-                    timeout=1,
-                )
-                print("Activity Event Sent:", event)
-            except Exception as e:
-                print("Failed to send event:", e)
-
-        # --- Always send device state to frontend ---
-        try:
+            queue_event(*event)
+            logger.debug("Activity Event Sent: %s", event)
+
+        # --- Send device state to frontend when it changes ---
+        tup = (self.fan, self.pump, self.light_on, self.feed_alert_sent)
+        if tup != self._last_state_tuple:
+            self._last_state_tuple = tup
             state = {
                 "fan": self.fan,
                 "pump": self.pump,
                 "light_on": self.light_on,
                 "feed_alert": self.feed_alert_sent,
             }
-            requests.post("http://127.0.0.1:5000/system-state", json=state, timeout=1)
-            print("Sent system state:", state)
-        except Exception as e:
-            print("Failed to send system state:", e)
-
-# --- Chicken Class ---
-class Chicken:
-    def __init__(self):
-        self.x = random.randint(100, 700)
-        self.y = random.randint(250, 400)
-        self.direction = random.uniform(0, 2 * math.pi)
-        self.speed = random.uniform(0.5, 1.5)
-        self.step_timer = 0
-        self.step_max = random.randint(20, 60)
-
-    def move(self):
+            queue_update("state", state)
+
+# --- Flock (all chickens as parallel arrays) ---
+class Flock:
+    LOW = np.array([80, 220], dtype=np.float32)
+    HIGH = np.array([WIDTH - 80, HEIGHT - 80], dtype=np.float32)
+
+    def __init__(self, count):
+        self.count = count
+        self.pos = np.random.uniform([100, 250], [700, 400], (count, 2)).astype(np.float32)
+        self.dir = np.random.uniform(0, 2 * math.pi, count)
+        self.spd = np.random.uniform(0.5, 1.5, count)
+        self.step_timer = np.zeros(count, dtype=np.int32)
+        self.step_max = np.random.randint(20, 61, count)
+        # cos/sin of dir, refreshed only for chickens whose direction changed
+        self.cos_d = np.cos(self.dir)
+        self.sin_d = np.sin(self.dir)
+
+    def _turn(self, mask):
+        self.cos_d[mask] = np.cos(self.dir[mask])
+        self.sin_d[mask] = np.sin(self.dir[mask])
+
+    def move_all(self):
+        """Advance every chicken one step: wander, clamp to the coop, bounce off walls."""
         self.step_timer += 1
-        if self.step_timer >= self.step_max:
-            self.direction = random.uniform(0, 2 * math.pi)
-            self.speed = random.uniform(0.5, 2)
-            self.step_timer = 0
-            self.step_max = random.randint(20, 60)
-        self.x += math.cos(self.direction) * self.speed
-        self.y += math.sin(self.direction) * self.speed
-        self.x = max(80, min(WIDTH - 80, self.x))
-        self.y = max(220, min(HEIGHT - 80, self.y))
-        if self.x <= 80 or self.x >= WIDTH - 80:
-            self.direction = math.pi - self.direction
-        if self.y <= 220 or self.y >= HEIGHT - 80:
-            self.direction = -self.direction
+        due = self.step_timer >= self.step_max
+        if due.any():
+            k = int(due.sum())
+            self.dir[due] = np.random.uniform(0, 2 * math.pi, k)
+            self.spd[due] = np.random.uniform(0.5, 2, k)
+            self.step_timer[due] = 0
+            self.step_max[due] = np.random.randint(20, 61, k)
+            self._turn(due)
+
+        self.pos[:, 0] += self.cos_d * self.spd
+        self.pos[:, 1] += self.sin_d * self.spd
+        np.clip(self.pos, self.LOW, self.HIGH, out=self.pos)
+
+        hit_x = (self.pos[:, 0] <= self.LOW[0]) | (self.pos[:, 0] >= self.HIGH[0])
+        hit_y = (self.pos[:, 1] <= self.LOW[1]) | (self.pos[:, 1] >= self.HIGH[1])
+        if hit_x.any() or hit_y.any():
+            self.dir[hit_x] = math.pi - self.dir[hit_x]
+            self.dir[hit_y] = -self.dir[hit_y]
+            self._turn(hit_x | hit_y)
 
     def draw(self, screen):
-        body_color = YELLOW
-        head_color = LIGHT_YELLOW
-        pygame.draw.ellipse(screen, body_color, (int(self.x - 10), int(self.y - 5), 20, 15))
-        head_x = int(self.x + 8 * math.cos(self.direction))
-        head_y = int(self.y + 8 * math.sin(self.direction))
-        pygame.draw.circle(screen, head_color, (head_x, head_y), 6)
-        beak_x = head_x + int(6 * math.cos(self.direction))
-        beak_y = head_y + int(6 * math.sin(self.direction))
-        pygame.draw.polygon(screen, RED, [
-            (beak_x, beak_y),
-            (beak_x - 3 * math.sin(self.direction), beak_y + 3 * math.cos(self.direction)),
-            (beak_x + 3 * math.sin(self.direction), beak_y - 3 * math.cos(self.direction)),
-        ])
+        for x, y, cos_d, sin_d in zip(self.pos[:, 0].tolist(), self.pos[:, 1].tolist(),
+                                      self.cos_d.tolist(), self.sin_d.tolist()):
+            draw_chicken(screen, x, y, cos_d, sin_d)
+
+def draw_chicken(screen, x, y, cos_d, sin_d):
+    body_color = YELLOW
+    head_color = LIGHT_YELLOW
+    pygame.draw.ellipse(screen, body_color, (int(x - 10), int(y - 5), 20, 15))
+    head_x = int(x + 8 * cos_d)
+    head_y = int(y + 8 * sin_d)
+    pygame.draw.circle(screen, head_color, (head_x, head_y), 6)
+    beak_x = head_x + int(6 * cos_d)
+    beak_y = head_y + int(6 * sin_d)
+    pygame.draw.polygon(screen, RED, [
+        (beak_x, beak_y),
+        (beak_x - 3 * sin_d, beak_y + 3 * cos_d),
+        (beak_x + 3 * sin_d, beak_y - 3 * cos_d),
+    ])
+
+# --- Text Rendering Cache ---
+_fonts = {}  # size -> pygame Font
+_text_cache = {}  # (text, color, size) -> rendered Surface
+TEXT_CACHE_LIMIT = 512
+
+def get_font(size):
+    """Load the default font once per size."""
+    font = _fonts.get(size)
+    if font is None:
+        font = _fonts[size] = pygame.font.Font(None, size)
+    return font
+
+def render_text(text, color, size=22):
+    """Render a string once and reuse the Surface until the text or color changes."""
+    key = (text, color, size)
+    surf = _text_cache.get(key)
+    if surf is None:
+        if len(_text_cache) >= TEXT_CACHE_LIMIT:
+            _text_cache.clear()
+        surf = _text_cache[key] = get_font(size).render(text, True, color)
+    return surf
 
 # --- Drawing Helpers ---
 def draw_trend_graph(screen, values, x, y, width, height, color, max_val):
-    if not values:
+    n = len(values)
+    if n == 0:
         return
     pygame.draw.rect(screen, (30, 30, 30), (x, y, width, height))
     pygame.draw.rect(screen, (50, 50, 50), (x, y, width, height), 1)
-    points = []
-    for i, val in enumerate(values):
-        px = x + (i / max(1, len(values) - 1)) * width
-        py = y + height - (val / max_val) * height
-        points.append((px, py))
-    if len(points) > 1:
-        pygame.draw.lines(screen, color, False, points, 2)
+    if n > 1:
+        px = x + np.arange(n) / (n - 1) * width
+        py = y + height - np.asarray(values) / max_val * height
+        pygame.draw.lines(screen, color, False, list(zip(px.tolist(), py.tolist())), 2)
 
 def draw_device(screen, pos, label, is_on, on_color, off_color, radius=25):
     x, y = pos
     color = on_color if is_on else off_color
     pygame.draw.circle(screen, color, (x, y), radius)
     pygame.draw.circle(screen, WHITE, (x, y), radius, 2)
-    font = pygame.font.Font(None, 22)
-    text = font.render(label, True, WHITE)
+    text = render_text(label, WHITE)
     screen.blit(text, (x - text.get_width() // 2, y + radius + 5))
     status = "ON" if is_on else "OFF"
     status_col = GREEN if is_on else GRAY
-    text = font.render(status, True, status_col)
+    text = render_text(status, status_col)
     screen.blit(text, (x - text.get_width() // 2, y - radius - 20))
 
+# --- Simulation Tick ---
+def step_simulation(state, flock):
+    """Advance the farm by one simulation tick and queue backend updates."""
+    # --- Update Environment + Automation ---
+    state.update()
+    state.automation_agent()
+    flock.move_all()
+
+    # --- Scan for chicken hotspots using radar ---
+    hotspots = state.radar_system.scan_hotspots(flock.pos)
+
+    # --- Send live updates to Flask ---
+    if state.time % 15 == 0:
+        data = {
+            "temperature": round(state.temperature, 2),
+            "humidity": round(random.uniform(45, 75), 2),
+            "tankLevel": round(state.water_level, 1),
+            "feed": round(state.feed_level, 1),
+            "light": round(state.light, 2),
+        }
+        queue_update("sensors", data)
+
+    # --- Send hotspot data to Flask ---
+    if state.time % 30 == 0:  # Send hotspot data every 30 ticks (1 second)
+        queue_update("hotspots", list(hotspots))
+        logger.debug("Radar Hotspots Sent: %d hotspots detected", len(hotspots))
+
+    if state.time % BULK_INTERVAL == 0:
+        flush_pending()
+
+def build_floor():
+    """Tile a single pre-drawn 50x50 floor tile across the coop floor."""
+    tile = pygame.Surface((50, 50))
+    tile.fill((130, 100, 60))
+    pygame.draw.rect(tile, (110, 80, 40), tile.get_rect(), 1)
+    floor = pygame.Surface((WIDTH, HEIGHT - 200))
+    floor.blits([(tile, (x, y)) for x in range(0, WIDTH, 50) for y in range(0, HEIGHT - 200, 50)], doreturn=False)
+    return floor
+
+def build_background():
+    """Draw everything that never changes (sky, floor, fixture bodies, labels) once."""
+    background = pygame.Surface((WIDTH, HEIGHT))
+    background.fill((20, 20, 40))
+    pygame.draw.rect(background, BROWN, (0, 180, WIDTH, HEIGHT - 180))
+    background.blit(build_floor(), (0, 200))
+
+    # Feed trough and water tank bodies (fill levels are drawn per frame)
+    pygame.draw.rect(background, GRAY, (50, 300, 150, 40), border_radius=5)
+    background.blit(render_text("Feed Trough", WHITE), (75, 350))
+    pygame.draw.rect(background, (50, 50, 70), (350, 100, 60, 120), border_radius=10)
+    background.blit(render_text("Water Tank", WHITE), (335, 80))
+    return background.convert()
+
+def build_control_panel():
+    """Draw the control panel frame and title once; blitted over the devices each frame."""
+    panel = pygame.Surface((200, 150), pygame.SRCALPHA)
+    pygame.draw.rect(panel, (40, 40, 40), (0, 0, 200, 150), border_radius=10)
+    pygame.draw.rect(panel, (80, 80, 80), (0, 0, 200, 150), 2, border_radius=10)
+    panel.blit(render_text("CONTROL PANEL", WHITE, 28), (15, 10))
+    return panel.convert_alpha()
+
 # --- Main Simulation Loop ---
 def run_simulation():
     pygame.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("🐔 Smart Chicken Farm Simulation")
-    clock = pygame.time.Clock()
-    font = pygame.font.Font(None, 28)
-    small_font = pygame.font.Font(None, 22)
 
     state = FarmState()
-    chickens = [Chicken() for _ in range(CHICKEN_COUNT)]
+    flock = Flock(CHICKEN_COUNT)
 
-    floor_tiles = [(x, y) for x in range(0, WIDTH, 50) for y in range(200, HEIGHT, 50)]
+    background = build_background()
+    control_panel = build_control_panel()
+    start_sender()
     running = True
 
-    while running:
-        for e in pygame.event.get():
-            if e.type == pygame.QUIT:
-                running = False
-
-        # --- Update Environment + Automation ---
-        state.update()
-        state.automation_agent()
-
-        # --- Scan for chicken hotspots using radar ---
-        hotspots = state.radar_system.scan_hotspots(chickens)
+    # Simulation and rendering run on their own deadlines
+    sim_step = 1.0 / SIM_HZ
+    frame_step = 1.0 / FPS
+    next_sim = next_frame = time.monotonic()
 
-        # --- Send live updates to Flask ---
-        if state.time % 15 == 0:
-            try:
-                data = {
-                    "temperature": round(state.temperature, 2),
-                    "humidity": round(random.uniform(45, 75), 2),
-                    "tankLevel": round(state.water_level, 1),
-                    "feed": round(state.feed_level, 1),
-                    "light": round(state.light, 2),
-                }
-                requests.post(SERVER_URL, json=data, timeout=1)
-            except Exception:
-                pass
-
-        # --- Send hotspot data to Flask ---
-        if state.time % 30 == 0:  # Send hotspot data every 30 frames (1 second)
-            try:
-                hotspot_data = {"hotspots": hotspots}
-                requests.post("http://127.0.0.1:5000/hotspot-data", json=hotspot_data, timeout=1)
-                print(f"Radar Hotspots Sent: {len(hotspots)} hotspots detected")
-            except Exception as e:
-                print(f"Failed to send hotspot data: {e}")
+    while running:
+        now = time.monotonic()
+
+        # --- Simulation ticks (catch up after a slow frame, but never spiral) ---
+        ticks = 0
+        while now >= next_sim and ticks < MAX_CATCHUP_TICKS:
+            step_simulation(state, flock)
+            next_sim += sim_step
+            ticks += 1
+        if now >= next_sim:
+            next_sim = now + sim_step
+
+        if now < next_frame:
+            time.sleep(max(0, min(next_sim, next_frame) - time.monotonic()))
+            continue
+        next_frame += frame_step
+        if next_frame < now:
+            next_frame = now + frame_step
+
+        # Only QUIT matters; drop everything else without building event objects
+        pygame.event.pump()
+        if pygame.event.peek(pygame.QUIT, pump=False):
+            running = False
+        pygame.event.clear(pump=False)
 
         # --- Draw Scene ---
-        screen.fill((20, 20, 40))
-        pygame.draw.rect(screen, BROWN, (0, 180, WIDTH, HEIGHT - 180))
-        for tile in floor_tiles:
-            pygame.draw.rect(screen, (130, 100, 60), (tile[0], tile[1], 50, 50))
-            pygame.draw.rect(screen, (110, 80, 40), (tile[0], tile[1], 50, 50), 1)
+        screen.blit(background, (0, 0))
 
         # Feed trough
-        pygame.draw.rect(screen, GRAY, (50, 300, 150, 40), border_radius=5)
         feed_w = int((state.feed_level / 100) * 150)
         pygame.draw.rect(screen, LIGHT_GREEN, (50, 300, feed_w, 40), border_radius=5)
         pygame.draw.rect(screen, WHITE, (50, 300, 150, 40), 2, border_radius=5)
-        screen.blit(small_font.render("Feed Trough", True, WHITE), (75, 350))
 
         # Devices
         draw_device(screen, (100, 120), "Light", state.light_on, YELLOW, (80, 80, 0))
@@ -385,29 +567,22 @@ def run_simulation():
                 pygame.draw.line(screen, LIGHT_BLUE, (700, 120), (x, y), 4)
 
         # Water Tank
-        pygame.draw.rect(screen, (50, 50, 70), (350, 100, 60, 120), border_radius=10)
         water_h = int((state.water_level / 100) * 120)
         pygame.draw.rect(screen, BLUE, (350, 220 - water_h, 60, water_h), border_radius=10)
         pygame.draw.rect(screen, WHITE, (350, 100, 60, 120), 2, border_radius=10)
-        screen.blit(small_font.render("Water Tank", True, WHITE), (335, 80))
         draw_device(screen, (440, 160), "Pump", state.pump, GREEN, (50, 100, 50), 15)
 
         # Chickens
-        for ch in chickens:
-            ch.move()
-            ch.draw(screen)
+        flock.draw(screen)
 
         # Graphs
-        draw_trend_graph(screen, state.history["temperature"], 500, 20, 160, 60, RED, 40)
-        screen.blit(small_font.render(f"Temp: {state.temperature:.1f}°C", True, WHITE), (500, 85))
-        draw_trend_graph(screen, state.history["light"], 500, 120, 160, 60, YELLOW, 600)
-        screen.blit(small_font.render(f"Light: {state.light:.0f} lux", True, WHITE), (500, 185))
+        draw_trend_graph(screen, state.trend("temperature"), 500, 20, 160, 60, RED, 40)
+        screen.blit(render_text(f"Temp: {state.temperature:.1f}°C", WHITE), (500, 85))
+        draw_trend_graph(screen, state.trend("light"), 500, 120, 160, 60, YELLOW, 600)
+        screen.blit(render_text(f"Light: {state.light:.0f} lux", WHITE), (500, 185))
 
         # Control panel
-        pygame.draw.rect(screen, (40, 40, 40), (20, 20, 200, 150), border_radius=10)
-        pygame.draw.rect(screen, (80, 80, 80), (20, 20, 200, 150), 2, border_radius=10)
-        screen.blit(font.render("CONTROL PANEL", True, WHITE), (35, 30))
-
+        screen.blit(control_panel, (20, 20))
         readings = [
             f"Temp: {state.temperature:.1f}°C",
             f"Light: {state.light:.0f} lux",
@@ -419,17 +594,17 @@ def run_simulation():
             if i == 0 and state.temperature > 30: color = RED
             elif i == 2 and state.water_level < 30: color = RED
             elif i == 3 and state.feed_level < 30: color = RED
-            screen.blit(font.render(r, True, color), (35, 60 + i * 25))
+            screen.blit(render_text(r, color, 28), (35, 60 + i * 25))
 
         # Status message
         if state.status_message:
-            msg = font.render(state.status_message, True, YELLOW)
+            msg = render_text(state.status_message, YELLOW, 28)
             screen.blit(msg, (WIDTH // 2 - msg.get_width() // 2, HEIGHT - 40))
 
         pygame.display.flip()
-        clock.tick(FPS)
 
     pygame.quit()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG if DEBUG else logging.WARNING)
     run_simulation()